@@ -6,6 +6,7 @@ from flask import Flask, jsonify, render_template, request
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from engine.core.database import init_db, BotConfig, Trade, RedisClient
+from engine.core.log_store import search_logs
 
 app = Flask(__name__)
 
@@ -83,5 +84,21 @@ def get_trades():
     finally:
         session.close()
 
+@app.route('/api/logs', methods=['GET'])
+def get_logs():
+    # Query params: q (full-text), level, bot_id, limit (1-500, clamped in search_logs)
+    session = Session()
+    try:
+        logs = search_logs(
+            session,
+            query=request.args.get('q'),
+            level=request.args.get('level'),
+            bot_id=request.args.get('bot_id', type=int),
+            limit=request.args.get('limit', 100, type=int)
+        )
+        return jsonify(logs)
+    finally:
+        session.close()
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
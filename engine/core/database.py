@@ -2,9 +2,10 @@ import os
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, Float, Boolean, DateTime, Index
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.schema import CreateIndex
 import redis
 
 # --- Configuration ---
@@ -37,9 +38,45 @@ class Log(Base):
     __tablename__ = 'logs'
 
     id = Column(Integer, primary_key=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.utcnow)  # first seen
     level = Column(String, nullable=False)
     message = Column(String, nullable=False)
+    bot_id = Column(Integer, nullable=True)
+    fingerprint = Column(String, nullable=True)  # hash of the normalized message, see log_store
+    count = Column(Integer, nullable=False, default=1)
+    last_seen = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_logs_last_seen', 'last_seen'),
+        Index('ix_logs_level_last_seen', 'level', 'last_seen'),
+        Index('ix_logs_bot_last_seen', 'bot_id', 'last_seen'),
+        Index('ix_logs_bot_fingerprint', 'bot_id', 'fingerprint'),
+        # Deduplicated rows, whose last_seen is out of id order (see log_store)
+        Index('ix_logs_recurring', 'last_seen', sqlite_where=text('count > 1')),
+    )
+
+# Columns added to `logs` after the first release, with their SQLite DDL.
+LOG_UPGRADE_COLUMNS = {
+    'bot_id': 'INTEGER',
+    'fingerprint': 'VARCHAR',
+    'count': 'INTEGER NOT NULL DEFAULT 1',
+    'last_seen': 'DATETIME',
+}
+
+# External-content FTS5 index over logs.message, kept in sync by triggers.
+# Dedup updates only touch count/last_seen, so the update trigger is scoped
+# to the message column and does not churn the index.
+LOG_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5("
+    "message, content='logs', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_ai AFTER INSERT ON logs BEGIN "
+    "INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message); END",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_ad AFTER DELETE ON logs BEGIN "
+    "INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message); END",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_au AFTER UPDATE OF message ON logs BEGIN "
+    "INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message); "
+    "INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message); END",
+]
 
 # --- Redis Client ---
 class RedisClient:
@@ -69,8 +106,38 @@ def init_db():
     
     engine = create_engine(DB_URL)
     Base.metadata.create_all(engine)
+    _upgrade_logs(engine)
     return sessionmaker(bind=engine)
 
+def _upgrade_logs(engine):
+    """Brings an existing `logs` table up to date: new columns, indexes and FTS."""
+    with engine.begin() as conn:
+        existing = {col['name'] for col in inspect(conn).get_columns('logs')}
+        for name, ddl in LOG_UPGRADE_COLUMNS.items():
+            if name in existing:
+                continue
+            try:
+                conn.execute(text(f"ALTER TABLE logs ADD COLUMN {name} {ddl}"))
+            except OperationalError as e:
+                # Another process (executor/dashboard) added it first
+                if 'duplicate column name' not in str(e):
+                    raise
+                continue
+            if name == 'last_seen':
+                conn.execute(text("UPDATE logs SET last_seen = timestamp"))
+
+        for index in Log.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+        fts_exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs_fts'"
+        )).first()
+        for statement in LOG_FTS_DDL:
+            conn.execute(text(statement))
+        if not fts_exists:
+            # Index rows written before the FTS table existed
+            conn.execute(text("INSERT INTO logs_fts(logs_fts) VALUES ('rebuild')"))
+
 if __name__ == "__main__":
     init_db()
     print(f"Database initialized at {DB_PATH}")
@@ -4,7 +4,8 @@ import traceback
 from datetime import datetime
 from typing import Optional
 
-from engine.core.database import init_db, BotConfig, Log, RedisClient
+from engine.core.database import init_db, BotConfig, RedisClient
+from engine.core.log_store import record_log
 
 class BotExecutor:
     def __init__(self, bot_id: int):
@@ -49,10 +50,8 @@ class BotExecutor:
         """Logs error to SQLite and Redis."""
         print(f"ERROR: {message}")
         
-        # Log to SQLite
-        log_entry = Log(level="ERROR", message=message)
-        self.session.add(log_entry)
-        self.session.commit()
+        # Log to SQLite (repeated tracebacks are folded into one row)
+        record_log(self.session, "ERROR", message, bot_id=self.bot_id)
         
         # Update Redis status
         self.redis.set_live_state(f"bot:{self.bot_id}:status", "ERROR")
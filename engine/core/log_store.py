@@ -0,0 +1,204 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, bindparam, or_, text, DateTime
+
+from engine.core.database import init_db, Log
+
+# --- Configuration ---
+ARCHIVE_DIR = "data/logs/archive"
+# Defaults for LOG_RETENTION_DAYS / LOG_MAX_ROWS, read from the environment
+# on each rotation (after the caller has loaded .env)
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_MAX_ROWS = 1000000
+ARCHIVE_BATCH_SIZE = 5000
+SEARCH_MAX_LIMIT = 500
+
+# Object addresses are the only part that changes between identical
+# tracebacks; other numbers (status codes, prices) make a different error
+_VOLATILE = re.compile(r"\b0x[0-9a-fA-F]+\b")
+
+def fingerprint(level: str, message: str) -> str:
+    """Stable hash of a log message with object addresses masked out."""
+    normalized = _VOLATILE.sub("#", message)
+    return hashlib.sha1(f"{level}\n{normalized}".encode("utf-8")).hexdigest()
+
+def record_log(session, level: str, message: str, bot_id: Optional[int] = None):
+    """
+    Stores a log row, folding repeats of the same message into one row.
+    A repeat bumps `count` and `last_seen` instead of storing the text again.
+    """
+    fp = fingerprint(level, message)
+    now = datetime.utcnow()
+
+    # Single statement, so a row archived by rotate_logs in the meantime just
+    # means a fresh insert instead of a stale ORM object
+    bumped = session.execute(text(
+        "UPDATE logs SET count = count + 1, last_seen = :now "
+        "WHERE bot_id IS :bot_id AND fingerprint = :fp"
+    ).bindparams(bindparam("now", type_=DateTime)), {"now": now, "bot_id": bot_id, "fp": fp}).rowcount
+
+    if bumped == 0:
+        session.add(Log(level=level, message=message, bot_id=bot_id,
+                        fingerprint=fp, count=1, timestamp=now, last_seen=now))
+    session.commit()
+
+def rotate_logs(session, retention_days: Optional[int] = None,
+                max_rows: Optional[int] = None, archive_dir: str = ARCHIVE_DIR) -> int:
+    """
+    Moves log rows older than `retention_days`, and any rows beyond the newest
+    `max_rows`, into gzipped JSON-lines archives. "Newest" is by last_seen, the
+    same order the dashboard shows, so a recurring error is kept.
+    Returns the number of rows archived.
+
+    SQLite reuses the freed pages, so the DB file stops growing once rotation
+    runs regularly; it does not shrink without a manual VACUUM.
+    """
+    if retention_days is None:
+        retention_days = int(os.getenv("LOG_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+    if max_rows is None:
+        max_rows = int(os.getenv("LOG_MAX_ROWS", DEFAULT_MAX_ROWS))
+
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    condition = Log.last_seen < cutoff
+
+    # Size cap: the max_rows-th newest row and everything older than it
+    boundary = (session.query(Log.last_seen, Log.id)
+                .order_by(Log.last_seen.desc(), Log.id.desc())
+                .offset(max_rows).first())
+    if boundary is not None:
+        condition = or_(condition, Log.last_seen < boundary.last_seen,
+                        and_(Log.last_seen == boundary.last_seen, Log.id <= boundary.id))
+
+    os.makedirs(archive_dir, exist_ok=True)
+    run_id = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+
+    archived = 0
+    while True:
+        batch = (session.query(Log).filter(condition)
+                 .order_by(Log.last_seen, Log.id).limit(ARCHIVE_BATCH_SIZE).all())
+        if not batch:
+            break
+
+        # One file per batch, synced to disk before its rows are deleted
+        archive_path = os.path.join(
+            archive_dir, f"logs-{run_id}-{os.getpid()}-{batch[0].id}.jsonl.gz")
+        with open(archive_path, "xb") as raw:
+            with gzip.open(raw, "wt", encoding="utf-8") as archive:
+                for entry in batch:
+                    archive.write(json.dumps(_to_dict(entry)) + "\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        # Re-check the condition: a row bumped by record_log since the select
+        # stays in the table (and is also in the archive)
+        ids = [entry.id for entry in batch]
+        archived += (session.query(Log).filter(Log.id.in_(ids), condition)
+                     .delete(synchronize_session=False))
+        session.commit()
+
+    return archived
+
+def search_logs(session, query: Optional[str] = None, level: Optional[str] = None,
+                bot_id: Optional[int] = None, limit: int = 100) -> list:
+    """
+    Returns the most recent log rows, newest first, optionally filtered by
+    level, bot and a full-text query over the message.
+    """
+    sql, params = _search_sql(query, level, bot_id, limit)
+    if sql is None:
+        return []
+    rows = session.execute(text(sql), params).mappings().all()
+    return [_row_to_dict(row) for row in rows]
+
+def _search_sql(query, level, bot_id, limit):
+    filters = []
+    params = {"limit": max(1, min(limit, SEARCH_MAX_LIMIT))}
+    if level:
+        filters.append("logs.level = :level")
+        params["level"] = level
+    if bot_id is not None:
+        filters.append("logs.bot_id = :bot_id")
+        params["bot_id"] = bot_id
+    where = "".join(f" AND {f}" for f in filters)
+
+    if not query:
+        sql = "SELECT logs.* FROM logs"
+        if filters:
+            sql += " WHERE " + " AND ".join(filters)
+        return sql + " ORDER BY logs.last_seen DESC LIMIT :limit", params
+
+    match = _fts_query(query)
+    if not match:
+        return None, params
+    params["match"] = match
+
+    # Candidates for the newest `limit` matches by last_seen:
+    # - single-occurrence rows: last_seen follows id order, so walking the FTS
+    #   match newest-first (CROSS JOIN keeps logs_fts outer) and stopping after
+    #   `limit` filtered hits is enough;
+    # - recurring rows (count > 1) can be old by id but fresh by last_seen, so
+    #   all of them are read from the partial index, probing FTS by rowid.
+    sql = (
+        "SELECT logs.* FROM logs WHERE logs.id IN ("
+        "SELECT rowid FROM (SELECT logs_fts.rowid FROM logs_fts "
+        "CROSS JOIN logs ON logs.id = logs_fts.rowid "
+        f"WHERE logs_fts MATCH :match{where} "
+        "ORDER BY logs_fts.rowid DESC LIMIT :limit) "
+        "UNION "
+        "SELECT logs.id FROM logs INDEXED BY ix_logs_recurring "
+        "CROSS JOIN logs_fts ON logs_fts.rowid = logs.id "
+        f"WHERE logs.count > 1{where} AND logs_fts MATCH :match"
+        ") ORDER BY logs.last_seen DESC LIMIT :limit"
+    )
+    return sql, params
+
+def _fts_query(query: str) -> str:
+    """Quotes each term so user input can never be parsed as FTS5 syntax."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+def _to_dict(entry: Log) -> dict:
+    return {
+        'id': entry.id,
+        'timestamp': entry.timestamp.isoformat() if entry.timestamp else None,
+        'last_seen': entry.last_seen.isoformat() if entry.last_seen else None,
+        'level': entry.level,
+        'bot_id': entry.bot_id,
+        'fingerprint': entry.fingerprint,
+        'count': entry.count,
+        'message': entry.message,
+    }
+
+def _row_to_dict(row) -> dict:
+    # Raw SQL returns SQLite datetimes as strings; normalize to ISO format
+    def iso(value):
+        return str(value).replace(" ", "T") if value else None
+
+    return {
+        'id': row['id'],
+        'timestamp': iso(row['timestamp']),
+        'last_seen': iso(row['last_seen']),
+        'level': row['level'],
+        'bot_id': row['bot_id'],
+        'fingerprint': row['fingerprint'],
+        'count': row['count'],
+        'message': row['message'],
+    }
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    Session = init_db()
+    session = Session()
+    try:
+        archived = rotate_logs(session)
+        print(f"Archived {archived} log rows to {ARCHIVE_DIR}")
+    finally:
+        session.close()
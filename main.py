@@ -6,6 +6,13 @@ import os
 # Load Environment
 load_dotenv()
 
+from sqlalchemy.exc import SQLAlchemyError
+
+from engine.core.database import init_db
+from engine.core.log_store import rotate_logs
+
+LOG_ROTATION_INTERVAL = 3600  # seconds
+
 def main():
     print("🚀 Initializing AlgoTrade Fleet...")
     
@@ -21,8 +28,26 @@ def main():
     # engine = TradingEngine()
     # engine.start()
 
+    Session = init_db()
+    last_rotation = 0
+
     while True:
         print("💓 System Heartbeat - Waiting for strategy execution...")
+
+        if time.time() - last_rotation >= LOG_ROTATION_INTERVAL:
+            # Set before rotating so a failing rotation waits a full interval
+            last_rotation = time.time()
+            session = Session()
+            try:
+                archived = rotate_logs(session)
+                if archived:
+                    print(f"🗄️ Archived {archived} old log rows.")
+            except (SQLAlchemyError, OSError) as e:
+                session.rollback()
+                print(f"Log rotation error: {e}")
+            finally:
+                session.close()
+
         time.sleep(10)
 
 if __name__ == "__main__":